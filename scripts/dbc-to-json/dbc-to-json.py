@@ -4,9 +4,12 @@ DBC to JSON converter
 Converts a DBC file to a structured JSON format for the telemetry system.
 """
 
+import hashlib
+import inspect
 import json
 import sys
 import os
+import tempfile
 from pathlib import Path
 
 try:
@@ -15,6 +18,15 @@ except ImportError:
     print("Error: cantools library not installed. Install with: pip install cantools")
     sys.exit(1)
 
+try:
+    import orjson
+except ImportError:
+    # Optional: orjson serializes much faster, stdlib json is used otherwise
+    orjson = None
+
+# Bump when the output structure of parse_dbc changes to invalidate old cache entries
+CACHE_VERSION = 1
+
 
 def parse_dbc(dbc_path: str) -> dict:
     """Parse DBC file and convert to JSON structure."""
@@ -97,27 +109,122 @@ def parse_dbc(dbc_path: str) -> dict:
     }
 
 
+def cache_dir() -> Path:
+    """Return the DBC cache directory, honouring XDG_CACHE_HOME (empty means unset)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "dbc-to-json"
+
+
+def parser_fingerprint() -> str:
+    """Identify the parser that produced a cache entry: cantools version plus parse_dbc itself."""
+    try:
+        source = inspect.getsource(parse_dbc).encode()
+    except (OSError, TypeError):
+        source = parse_dbc.__code__.co_code
+    return f"v{CACHE_VERSION}:cantools-{cantools.__version__}:{hashlib.blake2b(source).hexdigest()}:"
+
+
+def cache_path_for(dbc_path: str) -> Path:
+    """Return the cache file for a DBC, keyed by the parser fingerprint and its raw bytes."""
+    digest = hashlib.blake2b(parser_fingerprint().encode())
+    with open(dbc_path, 'rb') as f:
+        digest.update(f.read())
+    return cache_dir() / f"{digest.hexdigest()}.json"
+
+
+def restore_int_keys(data: dict) -> dict:
+    """Convert valTable keys back to ints after loading, matching parse_dbc output."""
+    for message in data["messages"]:
+        for signal in message["signals"]:
+            if "valTable" in signal:
+                signal["valTable"] = {int(k): v for k, v in signal["valTable"].items()}
+    data["valTables"] = {
+        name: {int(k): v for k, v in table.items()}
+        for name, table in data["valTables"].items()
+    }
+    return data
+
+
+def write_cache_entry(data: dict, cache_path: Path) -> None:
+    """Write a cache entry atomically so concurrent or interrupted runs never leave partial files."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write_json(data, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def parse_dbc_cached(dbc_path: str) -> dict:
+    """Parse DBC file, reusing a previous result if the file content and parser are unchanged."""
+    try:
+        cache_path = cache_path_for(dbc_path)
+    except RuntimeError as e:
+        # Path.home() fails without HOME or a passwd entry
+        print(f"Warning: DBC cache disabled, no cache directory available: {e}")
+        return parse_dbc(dbc_path)
+    
+    if cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = restore_int_keys(json.load(f))
+            print(f"Using cached parse: {cache_path}")
+            return data
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # Corrupt or unreadable entry, reparse and overwrite it
+            pass
+    
+    data = parse_dbc(dbc_path)
+    
+    try:
+        write_cache_entry(data, cache_path)
+    except OSError as e:
+        print(f"Warning: could not write DBC cache {cache_path}: {e}")
+    
+    return data
+
+
+def write_json(data: dict, output_path: str) -> None:
+    """Write data as indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        # valTable keys are ints, OPT_NON_STR_KEYS stringifies them like json does
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: dbc-to-json.py <input.dbc> [output.json]")
+    args = [arg for arg in sys.argv[1:] if arg != "--no-cache"]
+    use_cache = len(args) == len(sys.argv) - 1
+    
+    if len(args) < 1:
+        print("Usage: dbc-to-json.py [--no-cache] <input.dbc> [output.json]")
         sys.exit(1)
     
-    dbc_path = sys.argv[1]
+    dbc_path = args[0]
     if not os.path.exists(dbc_path):
         print(f"Error: DBC file not found: {dbc_path}")
         sys.exit(1)
     
-    output_path = sys.argv[2] if len(sys.argv) > 2 else "vehicle.json"
+    output_path = args[1] if len(args) > 1 else "vehicle.json"
     
     print(f"Parsing DBC file: {dbc_path}")
-    data = parse_dbc(dbc_path)
+    data = parse_dbc_cached(dbc_path) if use_cache else parse_dbc(dbc_path)
     
     output_dir = Path(output_path).parent
     if output_dir and not output_dir.exists():
         output_dir.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    write_json(data, output_path)
     
     print(f"Successfully converted DBC to JSON: {output_path}")
     print(f"Found {len(data['messages'])} messages")